@@ -1,50 +1,98 @@
 import streamlit as st
 import math
-import plotly.graph_objs as go
-import plotly.express as px
-import pandas as pd
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
 import numpy as np
 
+# Bound once at module level: math.pi is a LOAD_ATTR the interpreter cannot
+# constant-fold, and 9.81 / 1000*9.81 were repeated inside hot functions.
+_PI = math.pi
+_G = 9.81
+_GAMMA_W = 1000.0 * _G  # unit weight of water, N/m^3
+
+# Numba is optional: when available the fused stress kernel is JIT-compiled,
+# otherwise the same function runs as plain Python.
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+@lru_cache(maxsize=256)
+def _rankine_tangents(friction_angle_deg):
+    # tan(45 deg -/+ phi/2) pair. The friction angle is user-bounded, so
+    # repeated constructions with the same angle (sweeps, reruns) hit the
+    # cache instead of redoing the trig.
+    phi = math.radians(friction_angle_deg)
+    return math.tan(_PI / 4 - phi / 2), math.tan(_PI / 4 + phi / 2)
+
+# slots avoid the per-instance __dict__ (cheaper attribute access in the
+# compute path); frozen makes instances hashable, so they can be cache keys.
+@dataclass(slots=True, frozen=True)
 class SoilProperties:
-    def __init__(self, density, cohesion, friction_angle, k0):
-        self.density = density
-        self.cohesion = cohesion
-        self.friction_angle = math.radians(friction_angle)
-        self.k0 = k0
-
+    density: float
+    cohesion: float
+    friction_angle: float  # degrees in, stored as radians
+    k0: float
+    ka: float = field(init=False)
+    kp: float = field(init=False)
+    sqrt_ka: float = field(init=False)
+    sqrt_kp: float = field(init=False)
+    K: dict = field(init=False, compare=False, hash=False, repr=False)
+
+    def __post_init__(self):
+        # Rankine coefficients depend only on the friction angle, so compute
+        # them once here instead of per calculate_horizontal_stress call.
+        # sqrt(tan(x)**2) is just the (positive) tangent itself, so reusing the
+        # intermediates saves the two sqrt calls.
+        t_a, t_p = _rankine_tangents(self.friction_angle)
+        object.__setattr__(self, 'friction_angle', math.radians(self.friction_angle))
+        object.__setattr__(self, 'ka', t_a * t_a)
+        object.__setattr__(self, 'kp', t_p * t_p)
+        object.__setattr__(self, 'sqrt_ka', t_a)
+        object.__setattr__(self, 'sqrt_kp', t_p)
+        # Method -> (coefficient, cohesion offset), so horizontal stress is a
+        # single multiply-add per call with no per-call dict building.
+        object.__setattr__(self, 'K', {
+            'At Rest': (self.k0, 0.0),
+            'Active': (self.ka, -2 * self.cohesion * t_a),
+            'Passive': (self.kp, 2 * self.cohesion * t_p),
+        })
+
+@dataclass(slots=True, frozen=True)
 class TBMProperties:
-    def __init__(self, diameter, length, weight, face_pressure):
-        self.diameter = diameter
-        self.length = length
-        self.weight = weight
-        self.face_pressure = face_pressure
+    diameter: float
+    length: float
+    weight: float
+    face_pressure: float
+    shield_area: float = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'shield_area', _PI * self.diameter * self.length)
 
 def calculate_vertical_stress(depth, soil_properties):
-    g = 9.81
-    return soil_properties.density * g * depth
+    return soil_properties.density * _G * depth
 
 def calculate_horizontal_stress(vertical_stress, soil_properties, method):
-    if method == 'At Rest':
-        return soil_properties.k0 * vertical_stress
-    elif method == 'Active':
-        ka = math.tan(math.pi/4 - soil_properties.friction_angle/2)**2
-        return ka * vertical_stress - 2 * soil_properties.cohesion * math.sqrt(ka)
-    elif method == 'Passive':
-        kp = math.tan(math.pi/4 + soil_properties.friction_angle/2)**2
-        return kp * vertical_stress + 2 * soil_properties.cohesion * math.sqrt(kp)
+    K, offset = soil_properties.K[method]
+    return K * vertical_stress + offset
 
 def calculate_pore_pressure(depth, water_table_depth):
-    g = 9.81
-    water_density = 1000
-    if depth > water_table_depth:
-        return water_density * g * (depth - water_table_depth)
-    return 0
+    # Branchless: np.maximum works for scalars and arrays alike.
+    return _GAMMA_W * np.maximum(0.0, depth - water_table_depth)
 
 def calculate_effective_stress(total_stress, pore_pressure):
     return total_stress - pore_pressure
 
 def calculate_shield_surface_area(tbm_properties):
-    return math.pi * tbm_properties.diameter * tbm_properties.length
+    return tbm_properties.shield_area
 
 def calculate_normal_force(effective_stress, tbm_properties):
     shield_area = calculate_shield_surface_area(tbm_properties)
@@ -56,130 +104,366 @@ def calculate_shield_friction(normal_force, friction_coefficient):
 def calculate_total_resistance(shield_friction, tbm_properties):
     return shield_friction + tbm_properties.weight
 
-def create_tbm_visualization(tbm_properties, depth, water_table_depth, vertical_stress, horizontal_stress, pore_pressure, shield_friction):
-    fig = go.Figure()
-
-    # Ground surface
-    fig.add_trace(go.Scatter(x=[-tbm_properties.diameter, tbm_properties.diameter * 2], y=[0, 0],
-                             mode='lines', name='Ground Surface', line=dict(color='brown', width=2)))
-
-    # Water table
-    fig.add_trace(go.Scatter(x=[-tbm_properties.diameter, tbm_properties.diameter * 2], y=[-water_table_depth, -water_table_depth],
-                             mode='lines', name='Water Table', line=dict(color='blue', width=2, dash='dash')))
-
-    # Soil
-    fig.add_trace(go.Scatter(x=[-tbm_properties.diameter, tbm_properties.diameter * 2, tbm_properties.diameter * 2, -tbm_properties.diameter],
-                             y=[0, 0, -depth, -depth],
-                             fill='toself', fillcolor='tan', opacity=0.3, name='Soil', line=dict(color='tan')))
-
-    # TBM
-    fig.add_trace(go.Scatter(x=[0, tbm_properties.length, tbm_properties.length, 0],
-                             y=[-depth - tbm_properties.diameter/2, -depth - tbm_properties.diameter/2,
-                                -depth + tbm_properties.diameter/2, -depth + tbm_properties.diameter/2],
-                             fill='toself', fillcolor='gray', name='TBM', line=dict(color='black')))
-
-    # Stress arrows and labels
-    arrow_length = tbm_properties.diameter / 4
-    fig.add_annotation(x=tbm_properties.length/2, y=-depth,
-                       ax=tbm_properties.length/2, ay=-depth - arrow_length,
-                       text="", showarrow=True, arrowhead=2, arrowsize=1.5, arrowcolor="red", arrowwidth=2)
-    fig.add_annotation(x=tbm_properties.length, y=-depth + tbm_properties.diameter/2,
-                       ax=tbm_properties.length + arrow_length, ay=-depth + tbm_properties.diameter/2,
-                       text="", showarrow=True, arrowhead=2, arrowsize=1.5, arrowcolor="red", arrowwidth=2)
-
-    # Labels
-    fig.add_annotation(x=tbm_properties.length/2, y=-depth + tbm_properties.diameter * 0.6,
-                       text=f'Vertical Stress: {vertical_stress/1000:.2f} kPa',
-                       showarrow=False, yshift=10)
-    fig.add_annotation(x=tbm_properties.length * 1.1, y=-depth + tbm_properties.diameter/2,
-                       text=f'Horizontal Stress: {horizontal_stress/1000:.2f} kPa',
-                       showarrow=False, xshift=5)
-    fig.add_annotation(x=0, y=-depth - tbm_properties.diameter * 0.6,
-                       text=f'Shield Friction: {shield_friction/1000:.2f} kN',
-                       showarrow=False, yshift=-10)
-
-    # Pore pressure
-    if depth > water_table_depth:
-        pore_arrow_length = pore_pressure / (vertical_stress * 2) * tbm_properties.diameter
-        fig.add_annotation(x=tbm_properties.length/2, y=-depth,
-                           ax=tbm_properties.length/2, ay=-depth + pore_arrow_length,
-                           text="", showarrow=True, arrowhead=2, arrowsize=1.5, arrowcolor="blue", arrowwidth=2)
-        fig.add_annotation(x=tbm_properties.length/2, y=-depth + pore_arrow_length/2,
-                           text=f'Pore Pressure: {pore_pressure/1000:.2f} kPa',
-                           showarrow=False, font=dict(color="blue"))
+class StressMethod(IntEnum):
+    # Integer-valued so the kernel below dispatches on an int compare instead
+    # of string equality, which Numba nopython mode cannot compile.
+    AT_REST = 0
+    ACTIVE = 1
+    PASSIVE = 2
+
+# Selectbox label -> enum, resolved once at widget read.
+_METHOD_MAP = {'At Rest': StressMethod.AT_REST,
+               'Active': StressMethod.ACTIVE,
+               'Passive': StressMethod.PASSIVE}
+
+@njit(cache=True, fastmath=True)
+def _pipeline(depth, density, cohesion, k0, ka, sqrt_ka, kp, sqrt_kp, shield_area, weight, face_pressure, friction_coefficient, water_table_depth, method_id):
+    # Whole stress->resistance chain fused into one function on primitive
+    # floats, the shape Numba compiles to a single LLVM kernel. The Rankine
+    # coefficients and shield area are loop invariants, so callers pass them
+    # in precomputed rather than paying the trig and pi*d*L per sample.
+    vertical_stress = density * _G * depth
+    if method_id == 1:
+        horizontal_stress = ka * vertical_stress - 2 * cohesion * sqrt_ka
+    elif method_id == 2:
+        horizontal_stress = kp * vertical_stress + 2 * cohesion * sqrt_kp
+    else:
+        horizontal_stress = k0 * vertical_stress
+    pore_pressure = _GAMMA_W * max(0.0, depth - water_table_depth)
+    effective_stress = horizontal_stress - pore_pressure
+    normal_force = (effective_stress + face_pressure) * shield_area
+    shield_friction = friction_coefficient * normal_force
+    total_resistance = shield_friction + weight
+    return (vertical_stress, horizontal_stress, pore_pressure, effective_stress,
+            normal_force, shield_friction, total_resistance)
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _pipeline_batch(depths, density, cohesion, k0, ka, sqrt_ka, kp, sqrt_kp, shield_area, weight, face_pressure, friction_coefficient, water_table_depth, method_id):
+    out = np.empty((7, depths.size))
+    for i in prange(depths.size):
+        res = _pipeline(depths[i], density, cohesion, k0, ka, sqrt_ka, kp,
+                        sqrt_kp, shield_area, weight, face_pressure,
+                        friction_coefficient, water_table_depth, method_id)
+        for j in range(7):
+            out[j, i] = res[j]
+    return out
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _grid_batch(depths, friction_coefficients, density, cohesion, k0, ka, sqrt_ka, kp, sqrt_kp, shield_area, weight, face_pressure, water_table_depth, method_id):
+    # (depth, friction coefficient) grid. The stresses are independent of the
+    # friction coefficient, so each depth is computed once (with mu=1, making
+    # shield_friction the normal force) and scaled across the fc axis.
+    out = np.empty((depths.size, friction_coefficients.size, 7))
+    for i in prange(depths.size):
+        base = _pipeline(depths[i], density, cohesion, k0, ka, sqrt_ka, kp,
+                         sqrt_kp, shield_area, weight, face_pressure, 1.0,
+                         water_table_depth, method_id)
+        for j in range(friction_coefficients.size):
+            shield_friction = friction_coefficients[j] * base[4]
+            for k in range(5):
+                out[i, j, k] = base[k]
+            out[i, j, 5] = shield_friction
+            out[i, j, 6] = shield_friction + weight
+    return out
+
+def stresses_batch(depths, friction_coefficients, soil_properties, tbm_properties, water_table_depth, stress_calculation_method):
+    # Returns a (n_depths, n_fcs, 7) grid in _RESULT_KEYS order. JIT-parallel
+    # when numba is present, NumPy broadcasting otherwise.
+    depths = np.asarray(depths, dtype=float)
+    friction_coefficients = np.asarray(friction_coefficients, dtype=float)
+    method_id = int(_METHOD_MAP[stress_calculation_method])
+    args = (soil_properties.density, soil_properties.cohesion,
+            soil_properties.k0, soil_properties.ka, soil_properties.sqrt_ka,
+            soil_properties.kp, soil_properties.sqrt_kp,
+            tbm_properties.shield_area, tbm_properties.weight,
+            tbm_properties.face_pressure)
+    if _HAVE_NUMBA:
+        return _grid_batch(depths, friction_coefficients, *args,
+                           water_table_depth, method_id)
+    base = np.asarray(_pipeline_batch(depths, *args, 1.0, water_table_depth, method_id))
+    out = np.empty((depths.size, friction_coefficients.size, 7))
+    for k in range(5):
+        out[:, :, k] = base[k][:, None]
+    shield_friction = friction_coefficients[None, :] * base[4][:, None]
+    out[:, :, 5] = shield_friction
+    out[:, :, 6] = shield_friction + tbm_properties.weight
+    return out
+
+if _HAVE_NUMBA:
+    # Warm the JIT cache at import so the first user interaction does not pay
+    # the compile cost.
+    _pipeline(1.0, 1800.0, 5000.0, 0.5, 0.33, 0.58, 3.0, 1.73, 188.5, 5e6, 2e5, 0.3, 0.5, 0)
+    _pipeline_batch(np.ones(1), 1800.0, 5000.0, 0.5, 0.33, 0.58, 3.0, 1.73, 188.5, 5e6, 2e5, 0.3, 0.5, 0)
+    _grid_batch(np.ones(1), np.ones(1), 1800.0, 5000.0, 0.5, 0.33, 0.58, 3.0, 1.73, 188.5, 5e6, 2e5, 0.5, 0)
+
+def create_tbm_animation(tbm_properties, depth, water_table_depth):
+    # Deferred so the import cost is only paid when a figure is requested.
+    import plotly.graph_objs as go
+
+    # Single figure with precomputed frames; the browser animates client-side,
+    # so only one payload crosses the websocket instead of one render per frame.
+    x_positions = np.linspace(0, tbm_properties.length, 100)
+    y_bottom = -depth - tbm_properties.diameter / 2
+    y_top = -depth + tbm_properties.diameter / 2
+
+    def tbm_trace(x):
+        return go.Scatter(x=[x, x + tbm_properties.length, x + tbm_properties.length, x],
+                          y=[y_bottom, y_bottom, y_top, y_top],
+                          fill='toself', fillcolor='gray', name='TBM', line=dict(color='black'))
+
+    fig = go.Figure(
+        data=[
+            go.Scatter(x=[-tbm_properties.diameter, tbm_properties.length * 2], y=[0, 0],
+                       mode='lines', name='Ground Surface', line=dict(color='brown', width=2)),
+            go.Scatter(x=[-tbm_properties.diameter, tbm_properties.length * 2], y=[-water_table_depth, -water_table_depth],
+                       mode='lines', name='Water Table', line=dict(color='blue', width=2, dash='dash')),
+            tbm_trace(0.0),
+        ],
+        frames=[go.Frame(data=[tbm_trace(x)], traces=[2]) for x in x_positions],
+    )
 
     fig.update_layout(
-        title='TBM Shield Friction Visualization',
+        title='TBM Advance Animation',
         xaxis_title='Distance (m)',
         yaxis_title='Depth (m)',
         showlegend=False,
         yaxis_range=[-depth - tbm_properties.diameter, tbm_properties.diameter],
-        xaxis_range=[-tbm_properties.diameter, tbm_properties.diameter * 2],
+        xaxis_range=[-tbm_properties.diameter, tbm_properties.length * 2],
+        height=400,
+        updatemenus=[dict(type='buttons',
+                          buttons=[dict(label='Play', method='animate',
+                                        args=[None, dict(frame=dict(duration=30, redraw=False),
+                                                         fromcurrent=True)])])]
+    )
+
+    return fig
+
+# Preallocated coordinate buffers for create_tbm_visualization, refilled in
+# place per call: Plotly takes the ndarray fast path and no per-call Python
+# lists are built.
+_GROUND_XY = np.empty((2, 2))
+_WATER_XY = np.empty((2, 2))
+_SOIL_XY = np.empty((2, 4))
+_TBM_XY = np.empty((2, 4))
+
+@st.cache_resource
+def _visualization_template():
+    # The static part of the visualization layout never changes, so build the
+    # template once per server process instead of re-validating the same
+    # layout dict on every call.
+    import plotly.graph_objs as go
+
+    return go.layout.Template(layout=go.Layout(
+        title='TBM Shield Friction Visualization',
+        xaxis=dict(title='Distance (m)'),
+        yaxis=dict(title='Depth (m)'),
+        showlegend=False,
         height=600,
-        width=800
+        width=800,
+    ))
+
+@st.cache_resource
+def _visualization_base():
+    # The trace topology of the visualization is fixed (seven traces with
+    # constant styling); only the coordinates and label text vary. Build the
+    # styled skeleton once per server process and let each call copy it and
+    # fill in data, instead of re-validating trace styling dicts every time.
+    import plotly.graph_objs as go
+
+    fig = go.Figure(layout=dict(template=_visualization_template()))
+    fig.add_trace(go.Scatter(mode='lines', name='Ground Surface', line=dict(color='brown', width=2)))
+    fig.add_trace(go.Scatter(mode='lines', name='Water Table', line=dict(color='blue', width=2, dash='dash')))
+    fig.add_trace(go.Scatter(fill='toself', fillcolor='tan', opacity=0.3, name='Soil', line=dict(color='tan')))
+    fig.add_trace(go.Scatter(fill='toself', fillcolor='gray', name='TBM', line=dict(color='black')))
+    # Stress arrows: one trace with None-separated segments instead of one
+    # layout annotation per arrow, so Plotly.js draws them in a single pass.
+    fig.add_trace(go.Scatter(mode='lines', line=dict(color='red', width=2),
+                             showlegend=False, hoverinfo='skip'))
+    # Labels: one text trace instead of one annotation per label.
+    fig.add_trace(go.Scatter(mode='text', showlegend=False, hoverinfo='skip'))
+    # Pore pressure, toggled via visibility rather than added/removed.
+    fig.add_trace(go.Scatter(mode='lines+text', line=dict(color='blue', width=2),
+                             textfont=dict(color='blue'), textposition='top center',
+                             showlegend=False, hoverinfo='skip', visible=False))
+    return fig
+
+def create_tbm_visualization(tbm_properties, depth, water_table_depth, vertical_stress, horizontal_stress, pore_pressure, shield_friction):
+    import plotly.graph_objs as go
+
+    d = tbm_properties.diameter
+    _GROUND_XY[0] = (-d, d * 2)
+    _GROUND_XY[1] = (0, 0)
+    _WATER_XY[0] = (-d, d * 2)
+    _WATER_XY[1] = (-water_table_depth, -water_table_depth)
+    _SOIL_XY[0] = (-d, d * 2, d * 2, -d)
+    _SOIL_XY[1] = (0, 0, -depth, -depth)
+    _TBM_XY[0] = (0, tbm_properties.length, tbm_properties.length, 0)
+    _TBM_XY[1] = (-depth - d / 2, -depth - d / 2, -depth + d / 2, -depth + d / 2)
+
+    fig = go.Figure(_visualization_base())
+    ground, water, soil, tbm, arrows, labels, pore = fig.data
+
+    ground.x, ground.y = _GROUND_XY
+    water.x, water.y = _WATER_XY
+    soil.x, soil.y = _SOIL_XY
+    tbm.x, tbm.y = _TBM_XY
+
+    arrow_length = d / 4
+    arrows.x = (tbm_properties.length/2, tbm_properties.length/2, None,
+                tbm_properties.length + arrow_length, tbm_properties.length)
+    arrows.y = (-depth - arrow_length, -depth, None,
+                -depth + d/2, -depth + d/2)
+
+    labels.x = (tbm_properties.length/2, tbm_properties.length * 1.1, 0)
+    labels.y = (-depth + d * 0.6, -depth + d/2, -depth - d * 0.6)
+    labels.text = (f'Vertical Stress: {vertical_stress/1000:.2f} kPa',
+                   f'Horizontal Stress: {horizontal_stress/1000:.2f} kPa',
+                   f'Shield Friction: {shield_friction/1000:.2f} kN')
+
+    if depth > water_table_depth:
+        pore_arrow_length = pore_pressure / (vertical_stress * 2) * d
+        pore.visible = True
+        pore.x = (tbm_properties.length/2, tbm_properties.length/2)
+        pore.y = (-depth, -depth + pore_arrow_length)
+        pore.text = ('', f'Pore Pressure: {pore_pressure/1000:.2f} kPa')
+
+    # Only the data-dependent ranges are set per call; everything else comes
+    # from the cached template.
+    fig.update_layout(
+        yaxis_range=[-depth - tbm_properties.diameter, tbm_properties.diameter],
+        xaxis_range=[-tbm_properties.diameter, tbm_properties.diameter * 2]
     )
 
     return fig
 
+# The formula reference is fully static, so it is built once at import time and
+# emitted as a single markdown element instead of ~25 separate st.write/st.latex
+# calls per rerun.
+_FORMULAS_MD = r"""### Empirical Formulas for Shield Friction Calculation
+
+$$\text{Vertical Stress: } \sigma_v = \rho g h$$
+
+Where:
+- σv: Vertical stress
+- ρ: Soil density
+- g: Gravitational acceleration (9.81 m/s²)
+- h: Depth
+
+$$\text{Horizontal Stress: } \sigma_h = K \sigma_v$$
+
+Where K is:
+
+$$K_0 = \text{At Rest Earth Pressure Coefficient}$$
+
+$$K_a = \tan^2(45° - \phi/2) \text{ (Active)}$$
+
+$$K_p = \tan^2(45° + \phi/2) \text{ (Passive)}$$
+
+φ: Soil friction angle
+
+$$\text{Pore Water Pressure: } u = \gamma_w (h - h_w)$$
+
+Where:
+- u: Pore water pressure
+- γw: Unit weight of water
+- hw: Water table depth
+
+$$\text{Effective Stress: } \sigma' = \sigma - u$$
+
+$$\text{Normal Force: } N = (\sigma' + P_f) A$$
+
+Where:
+- N: Normal force
+- Pf: Face pressure
+- A: Shield surface area
+
+$$\text{Shield Friction: } F_f = \mu N$$
+
+Where:
+- Ff: Shield friction
+- μ: Friction coefficient
+
+$$\text{Total Resistance: } R = F_f + W$$
+
+Where:
+- R: Total resistance
+- W: TBM weight
+"""
+
 def display_formulas():
-    st.write("### Empirical Formulas for Shield Friction Calculation")
-    
-    st.latex(r"\text{Vertical Stress: } \sigma_v = \rho g h")
-    st.write("Where:")
-    st.write("- σv: Vertical stress")
-    st.write("- ρ: Soil density")
-    st.write("- g: Gravitational acceleration (9.81 m/s²)")
-    st.write("- h: Depth")
-    
-    st.latex(r"\text{Horizontal Stress: } \sigma_h = K \sigma_v")
-    st.write("Where K is:")
-    st.latex(r"K_0 = \text{At Rest Earth Pressure Coefficient}")
-    st.latex(r"K_a = \tan^2(45° - \phi/2) \text{ (Active)}")
-    st.latex(r"K_p = \tan^2(45° + \phi/2) \text{ (Passive)}")
-    st.write("φ: Soil friction angle")
-    
-    st.latex(r"\text{Pore Water Pressure: } u = \gamma_w (h - h_w)")
-    st.write("Where:")
-    st.write("- u: Pore water pressure")
-    st.write("- γw: Unit weight of water")
-    st.write("- hw: Water table depth")
-    
-    st.latex(r"\text{Effective Stress: } \sigma' = \sigma - u")
-    
-    st.latex(r"\text{Normal Force: } N = (\sigma' + P_f) A")
-    st.write("Where:")
-    st.write("- N: Normal force")
-    st.write("- Pf: Face pressure")
-    st.write("- A: Shield surface area")
-    
-    st.latex(r"\text{Shield Friction: } F_f = \mu N")
-    st.write("Where:")
-    st.write("- Ff: Shield friction")
-    st.write("- μ: Friction coefficient")
-    
-    st.latex(r"\text{Total Resistance: } R = F_f + W")
-    st.write("Where:")
-    st.write("- R: Total resistance")
-    st.write("- W: TBM weight")
+    st.markdown(_FORMULAS_MD)
+
+@st.cache_resource
+def _cached_visualization(diameter, length, weight, face_pressure, depth, water_table_depth, vertical_stress, horizontal_stress, pore_pressure, shield_friction):
+    # Figure construction keyed on the scalar inputs; resubmitting unchanged
+    # parameters returns the already-built figure.
+    tbm_properties = TBMProperties(diameter, length, weight, face_pressure)
+    return create_tbm_visualization(tbm_properties, depth, water_table_depth,
+                                    vertical_stress, horizontal_stress,
+                                    pore_pressure, shield_friction)
+
+_RESULT_KEYS = ("vertical_stress", "horizontal_stress", "pore_pressure",
+                "effective_stress", "normal_force", "shield_friction",
+                "total_resistance")
 
 def calculate_all_stresses(soil_properties, tbm_properties, depth, water_table_depth, friction_coefficient, stress_calculation_method):
-    vertical_stress = calculate_vertical_stress(depth, soil_properties)
-    horizontal_stress = calculate_horizontal_stress(vertical_stress, soil_properties, stress_calculation_method)
-    pore_pressure = calculate_pore_pressure(depth, water_table_depth)
-    effective_stress = calculate_effective_stress(horizontal_stress, pore_pressure)
-    normal_force = calculate_normal_force(effective_stress, tbm_properties)
-    shield_friction = calculate_shield_friction(normal_force, friction_coefficient)
-    total_resistance = calculate_total_resistance(shield_friction, tbm_properties)
-    
-    return {
-        "vertical_stress": vertical_stress,
-        "horizontal_stress": horizontal_stress,
-        "pore_pressure": pore_pressure,
-        "effective_stress": effective_stress,
-        "normal_force": normal_force,
-        "shield_friction": shield_friction,
-        "total_resistance": total_resistance
-    }
+    method_id = int(_METHOD_MAP[stress_calculation_method])
+    args = (soil_properties.density, soil_properties.cohesion,
+            soil_properties.k0, soil_properties.ka, soil_properties.sqrt_ka,
+            soil_properties.kp, soil_properties.sqrt_kp, tbm_properties.shield_area,
+            tbm_properties.weight, tbm_properties.face_pressure,
+            friction_coefficient, water_table_depth, method_id)
+    if np.ndim(depth) == 0:
+        values = _pipeline(float(depth), *args)
+    else:
+        values = _pipeline_batch(np.asarray(depth, dtype=float), *args)
+    return dict(zip(_RESULT_KEYS, values))
+
+@st.cache_data
+def compute_results(depth, water_table_depth, density, cohesion, friction_angle, k0, diameter, length, weight, face_pressure, friction_coefficient, stress_calculation_method):
+    # Memoized entry point for the UI: keyed on plain floats/strings so
+    # Streamlit can hash the inputs, meaning a rerun with unchanged widgets
+    # skips the whole computation.
+    soil_properties = SoilProperties(density, cohesion, friction_angle, k0)
+    tbm_properties = TBMProperties(diameter, length, weight, face_pressure)
+    return calculate_all_stresses(soil_properties, tbm_properties, depth,
+                                  water_table_depth, friction_coefficient,
+                                  stress_calculation_method)
+
+def compute_all(depths, soil_properties, tbm_properties, water_table_depth, friction_coefficient, stress_calculation_method):
+    # Array-valued version of the pipeline: every step broadcasts over a depth
+    # array, so depth sweeps run in NumPy instead of a Python loop per sample.
+    depths = np.asarray(depths, dtype=float)
+    return calculate_all_stresses(soil_properties, tbm_properties, depths,
+                                  water_table_depth, friction_coefficient,
+                                  stress_calculation_method)
+
+def compute_profile(max_depth, soil_properties, tbm_properties, water_table_depth, friction_coefficient, stress_calculation_method, n=500):
+    depths = np.linspace(0.0, max_depth, n)
+    results = compute_all(depths, soil_properties, tbm_properties,
+                          water_table_depth, friction_coefficient,
+                          stress_calculation_method)
+    return depths, results
+
+def create_depth_profile(soil_properties, tbm_properties, max_depth, water_table_depth, friction_coefficient, stress_calculation_method):
+    import plotly.graph_objs as go
+
+    depths, results = compute_profile(max_depth, soil_properties, tbm_properties,
+                                      water_table_depth, friction_coefficient,
+                                      stress_calculation_method)
+
+    fig = go.Figure()
+    # Scattergl renders on WebGL, so the profile stays smooth even with
+    # hundreds of points (SVG Scatter adds one DOM node per point).
+    fig.add_trace(go.Scattergl(x=depths, y=results["shield_friction"] / 1000,
+                               mode='lines', name='Shield Friction'))
+    fig.update_layout(
+        title='Shield Friction vs Depth',
+        xaxis_title='Depth (m)',
+        yaxis_title='Shield Friction (kN)',
+        height=400
+    )
+    return fig
 
 def main_page():
     st.title("TBM Shield Friction Calculator")
@@ -188,110 +472,148 @@ def main_page():
     
     display_formulas()
 
-def calculator_page():
+def calculator_page(show_visualization=False):
+    # Single page serving both the Calculator and Visualization navigation
+    # entries; they shared identical input widgets and only differed in what
+    # they rendered after submit.
     st.title("Calculator")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Tunnel and Soil Properties")
-        depth = st.number_input("Tunnel Depth (m)", value=10.0, step=0.1)
-        water_table_depth = st.number_input("Water Table Depth (m)", value=5.0, step=0.1)
-        density = st.number_input("Soil Density (kg/m³)", value=1800.0, step=10.0)
-        cohesion = st.number_input("Soil Cohesion (Pa)", value=5000.0, step=100.0)
-        friction_angle = st.number_input("Soil Friction Angle (degrees)", value=30.0, step=0.1)
-        k0 = st.number_input("Coefficient of Lateral Earth Pressure at Rest", value=0.5, step=0.01)
-    
-    with col2:
-        st.subheader("TBM Properties")
-        diameter = st.number_input("TBM Diameter (m)", value=6.0, step=0.1)
-        length = st.number_input("TBM Shield Length (m)", value=10.0, step=0.1)
-        weight = st.number_input("TBM Weight (N)", value=5e6, step=1e5)
-        face_pressure = st.number_input("TBM Face Pressure (Pa)", value=2e5, step=1e4)
-        friction_coefficient = st.number_input("Shield-Soil Friction Coefficient", value=0.3, step=0.01)
-        stress_calculation_method = st.selectbox("Stress Calculation Method", ['At Rest', 'Active', 'Passive'])
 
-    soil_properties = SoilProperties(density, cohesion, friction_angle, k0)
-    tbm_properties = TBMProperties(diameter, length, weight, face_pressure)
+    # Widgets inside a form do not rerun the script on every change; the
+    # compute and the figures are only rebuilt on submit.
+    with st.form("calculator_params"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Tunnel and Soil Properties")
+            depth = st.number_input("Tunnel Depth (m)", value=10.0, step=0.1)
+            water_table_depth = st.number_input("Water Table Depth (m)", value=5.0, step=0.1)
+            density = st.number_input("Soil Density (kg/m³)", value=1800.0, step=10.0)
+            cohesion = st.number_input("Soil Cohesion (Pa)", value=5000.0, step=100.0)
+            friction_angle = st.number_input("Soil Friction Angle (degrees)", value=30.0, step=0.1)
+            k0 = st.number_input("Coefficient of Lateral Earth Pressure at Rest", value=0.5, step=0.01)
+
+        with col2:
+            st.subheader("TBM Properties")
+            diameter = st.number_input("TBM Diameter (m)", value=6.0, step=0.1)
+            length = st.number_input("TBM Shield Length (m)", value=10.0, step=0.1)
+            weight = st.number_input("TBM Weight (N)", value=5e6, step=1e5)
+            face_pressure = st.number_input("TBM Face Pressure (Pa)", value=2e5, step=1e4)
+            friction_coefficient = st.number_input("Shield-Soil Friction Coefficient", value=0.3, step=0.01)
+            stress_calculation_method = st.selectbox("Stress Calculation Method", ['At Rest', 'Active', 'Passive'])
+
+        submitted = st.form_submit_button("Visualize" if show_visualization else "Calculate")
+
+    if submitted:
+        results = compute_results(depth, water_table_depth, density, cohesion,
+                                  friction_angle, k0, diameter, length, weight,
+                                  face_pressure, friction_coefficient,
+                                  stress_calculation_method)
+
+        import pandas as pd
 
-    if st.button("Calculate"):
-        results = calculate_all_stresses(soil_properties, tbm_properties, depth, water_table_depth, friction_coefficient, stress_calculation_method)
-        
         st.write("### Results")
-        for key, value in results.items():
-            st.write(f"{key.replace('_', ' ').title()}: {value:.2f} Pa")
-
-def visualization_page():
-    st.title("Calculator")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Tunnel and Soil Properties")
-        depth = st.number_input("Tunnel Depth (m)", value=10.0, step=0.1)
-        water_table_depth = st.number_input("Water Table Depth (m)", value=5.0, step=0.1)
-        density = st.number_input("Soil Density (kg/m³)", value=1800.0, step=10.0)
-        cohesion = st.number_input("Soil Cohesion (Pa)", value=5000.0, step=100.0)
-        friction_angle = st.number_input("Soil Friction Angle (degrees)", value=30.0, step=0.1)
-        k0 = st.number_input("Coefficient of Lateral Earth Pressure at Rest", value=0.5, step=0.01)
-    
-    with col2:
-        st.subheader("TBM Properties")
-        diameter = st.number_input("TBM Diameter (m)", value=6.0, step=0.1)
-        length = st.number_input("TBM Shield Length (m)", value=10.0, step=0.1)
-        weight = st.number_input("TBM Weight (N)", value=5e6, step=1e5)
-        face_pressure = st.number_input("TBM Face Pressure (Pa)", value=2e5, step=1e4)
-        friction_coefficient = st.number_input("Shield-Soil Friction Coefficient", value=0.3, step=0.01)
-        stress_calculation_method = st.selectbox("Stress Calculation Method", ['At Rest', 'Active', 'Passive'])
-
-    soil_properties = SoilProperties(density, cohesion, friction_angle, k0)
-    tbm_properties = TBMProperties(diameter, length, weight, face_pressure)
+        # One table element instead of one st.write round-trip per quantity.
+        st.table(pd.DataFrame([
+            {'Quantity': key.replace('_', ' ').title(), 'Value (Pa)': f'{value:.2f}'}
+            for key, value in results.items()
+        ]))
+
+        if show_visualization:
+            soil_properties = SoilProperties(density, cohesion, friction_angle, k0)
+            tbm_properties = TBMProperties(diameter, length, weight, face_pressure)
+
+            fig = _cached_visualization(diameter, length, weight, face_pressure,
+                                        depth, water_table_depth,
+                                        results["vertical_stress"], results["horizontal_stress"],
+                                        results["pore_pressure"], results["shield_friction"])
+            st.plotly_chart(fig)
+
+            anim_fig = create_tbm_animation(tbm_properties, depth, water_table_depth)
+            st.plotly_chart(anim_fig)
+
+            profile_fig = create_depth_profile(soil_properties, tbm_properties, 2 * depth,
+                                               water_table_depth, friction_coefficient,
+                                               stress_calculation_method)
+            st.plotly_chart(profile_fig)
+
+@st.cache_data
+def _build_sweep():
+    import pandas as pd
+
+    # The sweep is deterministic, so build the 250-row frame once and let
+    # reruns (e.g. navigating back to the page) reuse it.
+    depths = np.linspace(5, 50, 50)
+    friction_coefficients = np.linspace(0.1, 0.5, 5)
 
-    if st.button("Visualize"):
-        results = calculate_all_stresses(soil_properties, tbm_properties, depth, water_table_depth, friction_coefficient, stress_calculation_method)
-        
-        fig = create_tbm_visualization(tbm_properties, depth, water_table_depth, 
-                                       results["vertical_stress"], results["horizontal_stress"], 
-                                       results["pore_pressure"], results["shield_friction"])
-        st.plotly_chart(fig)
+    soil_properties = SoilProperties(1800, 5000, 30, 0.5)
+    tbm_properties = TBMProperties(6, 10, 5e6, 2e5)
+
+    grid = stresses_batch(depths, friction_coefficients, soil_properties,
+                          tbm_properties, 5, 'At Rest')
+    D, F = np.meshgrid(depths, friction_coefficients, indexing='ij')
+    columns = {key: grid[:, :, k].ravel() for k, key in enumerate(_RESULT_KEYS)}
+    columns['depth'] = D.ravel()
+    columns['friction_coefficient'] = F.ravel()
+    return pd.DataFrame(columns)
+
+@st.cache_data
+def _corr(df):
+    import pandas as pd
+
+    # float32 halves the bandwidth of the correlation pass, and constant
+    # columns would only contribute degenerate NaN rows to the heatmap.
+    # The sweep data is uniform float with no NaNs, so np.corrcoef can do all
+    # columns in one BLAS pass instead of pandas' per-pair dispatch.
+    cols = [c for c in df.columns if df[c].nunique() > 1]
+    matrix = df[cols].to_numpy(np.float32, copy=False)
+    return pd.DataFrame(np.corrcoef(matrix, rowvar=False), index=cols, columns=cols)
+
+@st.cache_resource
+def _scatter_3d(df):
+    import plotly.express as px
+
+    return px.scatter_3d(df, x='depth', y='friction_coefficient', z='shield_friction',
+                         color='total_resistance', title='3D Scatter Plot: Depth, Friction Coefficient, and Shield Friction',
+                         labels={'depth': 'Depth (m)', 'friction_coefficient': 'Friction Coefficient', 'shield_friction': 'Shield Friction (N)', 'total_resistance': 'Total Resistance (N)'})
 
 def data_analysis_page():
     st.title("Data Analysis")
 
     st.write("Explore how different factors influence TBM shield friction.")
 
-    # Generate sample data
-    depths = np.linspace(5, 50, 50)
-    friction_coefficients = np.linspace(0.1, 0.5, 5)
-    
-    results = []
-    for depth in depths:
-        for fc in friction_coefficients:
-            soil_properties = SoilProperties(1800, 5000, 30, 0.5)
-            tbm_properties = TBMProperties(6, 10, 5e6, 2e5)
-            res = calculate_all_stresses(soil_properties, tbm_properties, depth, 5, fc, 'At Rest')
-            res['depth'] = depth
-            res['friction_coefficient'] = fc
-            results.append(res)
-
-    df = pd.DataFrame(results)
-
-    # Depth vs Shield Friction for different friction coefficients
-    fig1 = px.line(df, x='depth', y='shield_friction', color='friction_coefficient',
-                   title='Depth vs Shield Friction for Different Friction Coefficients',
-                   labels={'depth': 'Depth (m)', 'shield_friction': 'Shield Friction (N)', 'friction_coefficient': 'Friction Coefficient'})
-    st.plotly_chart(fig1)
-
-    # Correlation heatmap
-    corr = df.corr()
-    fig2 = px.imshow(corr, title='Correlation Heatmap of Factors',
-                     labels=dict(color="Correlation Coefficient"))
-    st.plotly_chart(fig2)
+    df = _build_sweep()
+
+    # Depth vs Shield Friction for different friction coefficients.
+    # Altair ships a small vega-lite spec instead of a full Plotly figure.
+    import altair as alt
+    fig1 = alt.Chart(df).mark_line().encode(
+        x=alt.X('depth', title='Depth (m)'),
+        y=alt.Y('shield_friction', title='Shield Friction (N)'),
+        color=alt.Color('friction_coefficient:N', title='Friction Coefficient')
+    ).properties(title='Depth vs Shield Friction for Different Friction Coefficients')
+    st.altair_chart(fig1, use_container_width=True)
+
+    # Correlation heatmap, rendered server-side to a static PNG: the payload
+    # is O(pixels) and the chart needs no interactivity.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    corr = _corr(df)
+    fig2, ax = plt.subplots(figsize=(8, 6))
+    im = ax.imshow(corr)
+    ax.set_xticks(range(len(corr.columns)))
+    ax.set_xticklabels(corr.columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(corr.columns)))
+    ax.set_yticklabels(corr.columns)
+    ax.set_title('Correlation Heatmap of Factors')
+    fig2.colorbar(im, ax=ax, label='Correlation Coefficient')
+    fig2.tight_layout()
+    st.pyplot(fig2)
+    plt.close(fig2)
 
     # 3D scatter plot
-    fig3 = px.scatter_3d(df, x='depth', y='friction_coefficient', z='shield_friction',
-                         color='total_resistance', title='3D Scatter Plot: Depth, Friction Coefficient, and Shield Friction',
-                         labels={'depth': 'Depth (m)', 'friction_coefficient': 'Friction Coefficient', 'shield_friction': 'Shield Friction (N)', 'total_resistance': 'Total Resistance (N)'})
+    fig3 = _scatter_3d(df)
     st.plotly_chart(fig3)
 
 def main():
@@ -303,7 +625,7 @@ def main():
     elif page == "Calculator":
         calculator_page()
     elif page == "Visualization":
-        visualization_page()
+        calculator_page(show_visualization=True)
     elif page == "Data Analysis":
         data_analysis_page()
 